@@ -22,6 +22,7 @@ async_db = async_client[DATABASE_NAME]
 users_collection = async_db.users
 complaints_collection = async_db.complaints
 agencies_collection = async_db.agencies
+scheduler_leases_collection = async_db.scheduler_leases
 
 # Helper function to convert MongoDB _id to string
 def convert_id(obj):
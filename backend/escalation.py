@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, ExecutionTimeout
+from dotenv import load_dotenv
+from database import complaints_collection, scheduler_leases_collection
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Scheduler configuration
+ESCALATION_ENABLED = os.getenv("ESCALATION_ENABLED", "true").lower() == "true"
+ESCALATION_INTERVAL_SECONDS = int(os.getenv("ESCALATION_INTERVAL_SECONDS", "300"))
+ESCALATION_RUN_BUDGET_SECONDS = int(os.getenv("ESCALATION_RUN_BUDGET_SECONDS", "30"))
+ESCALATION_LEASE_SECONDS = int(os.getenv("ESCALATION_LEASE_SECONDS", str(ESCALATION_INTERVAL_SECONDS * 2)))
+ESCALATION_BATCH_SIZE = int(os.getenv("ESCALATION_BATCH_SIZE", "500"))
+# Complaints already at the top priority are re-routed here when set
+ESCALATION_AGENCY_ID = os.getenv("ESCALATION_AGENCY_ID")
+
+LEASE_NAME = "complaint_escalation"
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# SLA thresholds (hours without an update) per complaint category
+DEFAULT_SLA_HOURS = int(os.getenv("ESCALATION_DEFAULT_SLA_HOURS", "72"))
+CATEGORY_SLA_HOURS = {
+    "health": 24,
+    "security": 24,
+    "water": 48,
+    "education": 72,
+    "local": 96,
+    "roads": 120,
+}
+
+STALE_STATUSES = ["pending", "in_progress"]
+PRIORITY_LEVELS = ["low", "medium", "high", "urgent", "critical"]
+
+# Every escalation query is an equality/range match on this index, so a run
+# only ever touches stale complaints and never scans the whole collection.
+ESCALATION_INDEX_NAME = "escalation_category_status_priority_updated_at"
+ESCALATION_INDEX_KEYS = [
+    ("category", ASCENDING),
+    ("status", ASCENDING),
+    ("priority", ASCENDING),
+    ("updated_at", ASCENDING),
+]
+
+# Whether this worker held the lease on its latest attempt; run stats live on the lease
+escalation_stats = {
+    "is_leader": False,
+}
+
+
+async def ensure_indexes():
+    await complaints_collection.create_index(ESCALATION_INDEX_KEYS, name=ESCALATION_INDEX_NAME)
+
+
+async def acquire_lease(now: Optional[datetime] = None) -> bool:
+    """Take or renew the scheduler lease. Only the holder runs escalations."""
+    now = now or datetime.utcnow()
+    try:
+        lease = await scheduler_leases_collection.find_one_and_update(
+            {
+                "_id": LEASE_NAME,
+                "$or": [{"holder": WORKER_ID}, {"expires_at": {"$lte": now}}],
+            },
+            {
+                "$set": {
+                    "holder": WORKER_ID,
+                    "expires_at": now + timedelta(seconds=ESCALATION_LEASE_SECONDS),
+                    "renewed_at": now,
+                }
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        # Another worker holds an unexpired lease, so the upsert collided with it
+        return False
+    return lease is not None and lease["holder"] == WORKER_ID
+
+
+async def release_lease():
+    await scheduler_leases_collection.update_one(
+        {"_id": LEASE_NAME, "holder": WORKER_ID},
+        {"$set": {"expires_at": datetime.utcnow()}},
+    )
+
+
+def _escalation_targets(now: datetime):
+    """Yield (category filter, SLA cutoff) pairs covering every category."""
+    for category, hours in CATEGORY_SLA_HOURS.items():
+        yield category, now - timedelta(hours=hours)
+    yield {"$nin": list(CATEGORY_SLA_HOURS)}, now - timedelta(hours=DEFAULT_SLA_HOURS)
+
+
+def _build_update(complaint: dict, now: datetime) -> Optional[UpdateOne]:
+    # Match on the values we read so a concurrent user update wins over us
+    match = {
+        "_id": complaint["_id"],
+        "priority": complaint["priority"],
+        "updated_at": complaint["updated_at"],
+    }
+    level = PRIORITY_LEVELS.index(complaint["priority"])
+    if level < len(PRIORITY_LEVELS) - 1:
+        return UpdateOne(match, {
+            "$set": {
+                "priority": PRIORITY_LEVELS[level + 1],
+                "escalated_at": now,
+                "updated_at": now,
+            },
+            "$inc": {"escalation_count": 1},
+        })
+    if ESCALATION_AGENCY_ID:
+        return UpdateOne(match, {
+            "$set": {
+                "agency_id": ObjectId(ESCALATION_AGENCY_ID),
+                "escalated_at": now,
+                "updated_at": now,
+            },
+            "$inc": {"escalation_count": 1},
+        })
+    return None
+
+
+async def run_escalation() -> dict:
+    """Escalate complaints that exceeded their category SLA.
+
+    Escalated complaints get a fresh ``updated_at``, which moves them out of
+    the stale query, so a run that stops at its time budget is simply resumed
+    by the next one.
+    """
+    started_at = datetime.utcnow()
+    deadline = started_at + timedelta(seconds=ESCALATION_RUN_BUDGET_SECONDS)
+    stats = {
+        "started_at": started_at,
+        "finished_at": None,
+        "scanned": 0,
+        "priority_bumped": 0,
+        "rerouted": 0,
+        "escalated": 0,
+        "conflicts": 0,
+        "batches": 0,
+        "completed": False,
+    }
+
+    priorities = PRIORITY_LEVELS[:-1]
+    if ESCALATION_AGENCY_ID:
+        priorities = PRIORITY_LEVELS
+
+    completed = True
+    for category, cutoff in _escalation_targets(started_at):
+        while True:
+            remaining_ms = (deadline - datetime.utcnow()).total_seconds() * 1000
+            if remaining_ms <= 0:
+                completed = False
+                break
+
+            query = {
+                "category": category,
+                "status": {"$in": STALE_STATUSES},
+                "priority": {"$in": priorities},
+                "updated_at": {"$lt": cutoff},
+            }
+            if ESCALATION_AGENCY_ID:
+                query["agency_id"] = {"$ne": ObjectId(ESCALATION_AGENCY_ID)}
+
+            try:
+                # max_time_ms(0) means no limit, so never let the budget round down to it
+                complaints = await complaints_collection.find(
+                    query, {"_id": 1, "priority": 1, "updated_at": 1}
+                ).hint(ESCALATION_INDEX_NAME).limit(ESCALATION_BATCH_SIZE).max_time_ms(
+                    max(1, int(remaining_ms))
+                ).to_list(length=None)
+            except ExecutionTimeout:
+                completed = False
+                break
+            if not complaints:
+                break
+
+            now = datetime.utcnow()
+            # Bumps and reroutes are written separately so each count comes
+            # from the write result rather than from what was attempted
+            requests = {"priority_bumped": [], "rerouted": []}
+            for complaint in complaints:
+                update = _build_update(complaint, now)
+                if update is None:
+                    continue
+                action = "rerouted" if complaint["priority"] == PRIORITY_LEVELS[-1] else "priority_bumped"
+                requests[action].append(update)
+            stats["scanned"] += len(complaints)
+            if not any(requests.values()):
+                break
+
+            for action, updates in requests.items():
+                if not updates:
+                    continue
+                result = await complaints_collection.bulk_write(updates, ordered=False)
+                stats["batches"] += 1
+                stats[action] += result.modified_count
+                stats["escalated"] += result.modified_count
+                stats["conflicts"] += len(updates) - result.modified_count
+
+            if len(complaints) < ESCALATION_BATCH_SIZE:
+                break
+        if not completed:
+            break
+
+    stats["finished_at"] = datetime.utcnow()
+    stats["completed"] = completed
+    await scheduler_leases_collection.update_one(
+        {"_id": LEASE_NAME, "holder": WORKER_ID},
+        {"$set": {"last_run": stats}, "$inc": {"runs": 1}},
+    )
+    logger.info(
+        "Escalation run finished: scanned=%s escalated=%s conflicts=%s completed=%s",
+        stats["scanned"], stats["escalated"], stats["conflicts"], completed,
+    )
+    return stats
+
+
+async def get_escalation_stats() -> dict:
+    """Stats of the latest run, as recorded by whichever worker holds the lease."""
+    lease = await scheduler_leases_collection.find_one({"_id": LEASE_NAME}) or {}
+    return {
+        "worker_id": WORKER_ID,
+        "is_leader": escalation_stats["is_leader"],
+        "leader": lease.get("holder"),
+        "lease_expires_at": lease.get("expires_at"),
+        "runs": lease.get("runs", 0),
+        "last_run": lease.get("last_run"),
+    }
+
+
+async def run_scheduler():
+    logger.info("Escalation scheduler started on worker %s", WORKER_ID)
+    indexes_ready = False
+    while True:
+        try:
+            # Retried every interval so a Mongo outage at startup does not kill the task
+            if not indexes_ready:
+                await ensure_indexes()
+                indexes_ready = True
+            escalation_stats["is_leader"] = await acquire_lease()
+            if escalation_stats["is_leader"]:
+                await run_escalation()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            escalation_stats["is_leader"] = False
+            logger.error("Escalation run failed: %s", e, exc_info=True)
+        await asyncio.sleep(ESCALATION_INTERVAL_SECONDS)
@@ -0,0 +1,218 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import zlib
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Logging configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_INFO_SAMPLE_RATE = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1.0"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Seconds a WARNING or above may wait for room in a full queue before it is
+# written synchronously instead
+LOG_QUEUE_BLOCK_SECONDS = float(os.getenv("LOG_QUEUE_BLOCK_SECONDS", "0.5"))
+
+# Per-request loggers whose INFO records are sampled; everything else is kept
+SAMPLED_LOGGERS = ("routers",)
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+SENSITIVE_KEYS = {
+    "password",
+    "hashed_password",
+    "access_token",
+    "token",
+    "authorization",
+    "secret_key",
+    "national_id",
+}
+REDACTED = "***"
+# An auth scheme such as ``Bearer`` is redacted together with the credential after it
+_SENSITIVE_PATTERN = re.compile(
+    r"(?i)((?<!\w)['\"]?(?:%s)\b['\"]?\s*[:=]\s*)"
+    r"('[^']*'|\"[^\"]*\"|(?:(?:bearer|basic)\s+)?[^\s,}\]'\"]+)"
+    % "|".join(sorted(SENSITIVE_KEYS))
+)
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id",
+    # uvicorn's ANSI-coloured duplicate of the message
+    "color_message",
+}
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_stream_handler: Optional[logging.Handler] = None
+
+
+def redact(value):
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if str(k).lower() in SENSITIVE_KEYS else redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return type(value)(redact(v) for v in value)
+    return value
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the id of the request being handled."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep INFO and lower records from a fraction of requests.
+
+    The decision is made once per request by hashing its id, so a sampled
+    request keeps all of its lines. Only ``SAMPLED_LOGGERS`` are sampled, and
+    warnings, errors and records outside a request always pass.
+    """
+
+    def __init__(self, rate: float, loggers=SAMPLED_LOGGERS):
+        super().__init__()
+        self.rate = rate
+        self.loggers = tuple(loggers)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        request_id = getattr(record, "request_id", None)
+        if request_id is None:
+            return True
+        if not any(record.name == name or record.name.startswith(name + ".") for name in self.loggers):
+            return True
+        return zlib.crc32(request_id.encode()) % 10000 < self.rate * 10000
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as single-line JSON with sensitive fields redacted."""
+
+    def format(self, record):
+        if isinstance(record.args, (dict, tuple)):
+            record.args = redact(record.args)
+        message = _SENSITIVE_PATTERN.sub(r"\1" + REDACTED, record.getMessage())
+        entry = {
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": message,
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = redact({key: value})[key]
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        elif record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hand records to the listener thread without formatting them first.
+
+    ``QueueHandler.prepare`` renders the message on the calling thread; here
+    only the args are snapshotted (and redacted) so later mutation by the
+    caller cannot leak into the log line, and tracebacks are rendered so
+    request frames are not kept alive. When the queue is full, INFO and lower
+    records are dropped and counted; warnings and above wait briefly and are
+    then written synchronously rather than lost.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        if isinstance(record.args, (dict, tuple)):
+            record.args = redact(record.args)
+        if record.exc_info:
+            record.exc_text = self.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                self.dropped += 1
+                return
+        try:
+            self.queue.put(record, timeout=LOG_QUEUE_BLOCK_SECONDS)
+        except queue.Full:
+            sys.stderr.write(self.format(record) + "\n")
+
+
+def setup_logging():
+    """Route all logging through a queue drained by a background thread."""
+    global _listener, _queue_handler, _stream_handler
+    if _listener is not None:
+        return
+
+    formatter = JsonFormatter()
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.setFormatter(formatter)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter(LOG_INFO_SAMPLE_RATE))
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    # uvicorn installs its own synchronous stderr handlers; send its records
+    # through the queue like everything else
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        for handler in list(uvicorn_logger.handlers):
+            uvicorn_logger.removeHandler(handler)
+        uvicorn_logger.propagate = True
+
+    _queue_handler = queue_handler
+    _stream_handler = stream_handler
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records and stop the background thread.
+
+    The root logger then writes through the stream handler directly, so
+    records logged during the rest of shutdown are not lost.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    _queue_handler = None
+    root.addHandler(_stream_handler)
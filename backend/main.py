@@ -1,9 +1,21 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from datetime import datetime
+import asyncio
+import logging
+import uuid
+from logging_config import setup_logging, stop_logging, request_id_var
+
+# Configure logging before anything else logs
+setup_logging()
+
 from routers import users, complaints, agencies
 from database import client
+from compression import CompressionMiddleware
+import escalation
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Rwanda Citizen Engagement System API",
@@ -20,15 +32,54 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (brotli when available, gzip otherwise)
+app.add_middleware(CompressionMiddleware)
+
+@app.middleware("http")
+async def add_request_id(request: Request, call_next):
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # Include routers
 app.include_router(users.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(complaints.router, prefix="/api/complaints", tags=["Complaints"])
 app.include_router(agencies.router, prefix="/api/agencies", tags=["Agencies"])
 
+@app.on_event("startup")
+async def start_escalation_scheduler():
+    if escalation.ESCALATION_ENABLED:
+        app.state.escalation_task = asyncio.create_task(escalation.run_scheduler())
+
+@app.on_event("shutdown")
+async def stop_escalation_scheduler():
+    task = getattr(app.state, "escalation_task", None)
+    if task:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error("Escalation scheduler stopped with an error: %s", e, exc_info=True)
+        try:
+            await escalation.release_lease()
+        except Exception as e:
+            logger.error("Failed to release escalation lease: %s", e, exc_info=True)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
 
+@app.on_event("shutdown")
+async def shutdown_logging():
+    stop_logging()
+
 @app.get("/")
 async def root():
     return {
@@ -48,4 +99,4 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=5000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=5000, log_config=None) 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, create_model
 from bson import ObjectId
 
 class PyObjectId(ObjectId):
@@ -25,6 +25,15 @@ class MongoBaseModel(BaseModel):
         json_encoders = {ObjectId: str}
         allow_population_by_field_name = True
 
+def partial_model(model, exclude=()):
+    """Copy ``model`` with every field optional, for ``fields=`` projections."""
+    fields = {
+        name: (Optional[field.outer_type_], None)
+        for name, field in model.__fields__.items()
+        if name != "id" and name not in exclude
+    }
+    return create_model(f"{model.__name__}Partial", __base__=MongoBaseModel, **fields)
+
 class UserBase(MongoBaseModel):
     email: EmailStr
     full_name: str
@@ -73,4 +82,9 @@ class AgencyCreate(AgencyBase):
 
 class Agency(AgencyBase):
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow) 
\ No newline at end of file
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+# Partial models back the ``fields=`` list endpoints; password hashes are never exposed
+UserPartial = partial_model(User, exclude={"hashed_password"})
+ComplaintPartial = partial_model(Complaint)
+AgencyPartial = partial_model(Agency)
@@ -0,0 +1,43 @@
+from typing import List, Optional, Type
+from fastapi import HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from database import convert_id
+
+def fields_projection(model: Type[BaseModel]):
+    """Build a dependency turning a ``fields=a,b`` query parameter into a Mongo projection.
+
+    Field names are checked against ``model`` so only fields it exposes can be
+    requested. The document id is always returned.
+    """
+    allowed = {name for name in model.__fields__ if name != "id"}
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated subset of fields to return: {', '.join(sorted(allowed))}"
+        )
+    ) -> Optional[dict]:
+        if not fields:
+            return None
+
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        requested -= {"id", "_id"}
+        unknown = requested - allowed
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+
+        projection = {name: 1 for name in requested}
+        projection["_id"] = 1
+        return projection
+
+    return dependency
+
+def partial_response(model: Type[BaseModel], documents: List[dict]) -> JSONResponse:
+    """Serialize projected documents, leaving out the fields that were not requested."""
+    items = [model(**convert_id(document)) for document in documents]
+    return JSONResponse(content=jsonable_encoder(items, by_alias=True, exclude_unset=True))
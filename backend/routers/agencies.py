@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from models import Agency, AgencyCreate
+from models import Agency, AgencyCreate, AgencyPartial
 from database import agencies_collection, users_collection, convert_id
 from routers.users import get_current_user
+from projection import fields_projection, partial_response
 from bson import ObjectId
 
 router = APIRouter()
@@ -40,9 +41,12 @@ async def create_agency(
 async def read_agencies(
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    projection: Optional[dict] = Depends(fields_projection(AgencyPartial))
 ):
-    agencies = await agencies_collection.find().skip(skip).limit(limit).to_list(length=None)
+    agencies = await agencies_collection.find({}, projection).skip(skip).limit(limit).to_list(length=None)
+    if projection is not None:
+        return partial_response(AgencyPartial, agencies)
     return [convert_id(agency) for agency in agencies]
 
 @router.get("/{agency_id}", response_model=Agency)
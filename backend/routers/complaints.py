@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from typing import List, Optional
 from datetime import datetime
-from models import Complaint, ComplaintCreate
+from models import Complaint, ComplaintCreate, ComplaintPartial
 from database import complaints_collection, users_collection, agencies_collection, convert_id
 from routers.users import get_current_user
+from escalation import get_escalation_stats
+from projection import fields_projection, partial_response
 from bson import ObjectId
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -19,7 +19,7 @@ async def create_complaint(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        logger.info(f"Received complaint creation request from user: {current_user.get('_id')}")
+        logger.info("Received complaint creation request from user: %s", current_user.get('_id'))
         complaint_dict = complaint.dict()
         complaint_dict["user_id"] = ObjectId(current_user["_id"])
         complaint_dict["created_at"] = datetime.utcnow()
@@ -27,10 +27,10 @@ async def create_complaint(
 
         result = await complaints_collection.insert_one(complaint_dict)
         created_complaint = await complaints_collection.find_one({"_id": result.inserted_id})
-        logger.info(f"Successfully created complaint with id: {result.inserted_id}")
+        logger.info("Successfully created complaint with id: %s", result.inserted_id)
         return convert_id(created_complaint)
     except Exception as e:
-        logger.error(f"Error creating complaint: {e}", exc_info=True)
+        logger.error("Error creating complaint: %s", e, exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while creating complaint: {e}")
 
 @router.get("/", response_model=List[Complaint])
@@ -38,10 +38,11 @@ async def read_complaints(
     current_user: dict = Depends(get_current_user),
     skip: int = 0,
     limit: int = 10,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    projection: Optional[dict] = Depends(fields_projection(ComplaintPartial))
 ):
     try:
-        logger.info(f"Received request to read complaints for user: {current_user.get('_id')} with role: {current_user.get('role')}")
+        logger.info("Received request to read complaints for user: %s with role: %s", current_user.get('_id'), current_user.get('role'))
         query = {}
 
         # Filter by user role
@@ -53,42 +54,51 @@ async def read_complaints(
                 query["agency_id"] = agency["_id"]
             else:
                 # If agency admin is not linked to an agency, they see no complaints
-                logger.info(f"Agency admin user {current_user.get('_id')} is not linked to an agency. Returning empty list.")
+                logger.info("Agency admin user %s is not linked to an agency. Returning empty list.", current_user.get('_id'))
                 return []
 
         # Filter by status if provided
         if status:
             query["status"] = status
 
-        logger.info(f"Querying complaints collection with query: {query}")
-        complaints = await complaints_collection.find(query).skip(skip).limit(limit).to_list(length=None)
-        logger.info(f"Found {len(complaints)} complaints.")
+        logger.info("Querying complaints collection with query: %s projection: %s", query, projection)
+        complaints = await complaints_collection.find(query, projection).skip(skip).limit(limit).to_list(length=None)
+        logger.info("Found %s complaints.", len(complaints))
+        if projection is not None:
+            return partial_response(ComplaintPartial, complaints)
         return [convert_id(complaint) for complaint in complaints]
     except Exception as e:
-        logger.error(f"Error reading complaints: {e}", exc_info=True)
+        logger.error("Error reading complaints: %s", e, exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while reading complaints: {e}")
 
+@router.get("/escalation/stats")
+async def read_escalation_stats(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "system_admin":
+        logger.warning("User %s is not authorized to view escalation stats.", current_user.get('_id'))
+        raise HTTPException(status_code=403, detail="Only system admin can view escalation stats")
+    return await get_escalation_stats()
+
 @router.get("/{complaint_id}", response_model=Complaint)
 async def read_complaint(
     complaint_id: str,
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        logger.info(f"Received request to read complaint {complaint_id} for user: {current_user.get('_id')}")
+        logger.info("Received request to read complaint %s for user: %s", complaint_id, current_user.get('_id'))
         complaint = await complaints_collection.find_one({"_id": ObjectId(complaint_id)})
         if not complaint:
-            logger.warning(f"Complaint {complaint_id} not found.")
+            logger.warning("Complaint %s not found.", complaint_id)
             raise HTTPException(status_code=404, detail="Complaint not found")
 
         # Check authorization
         if current_user["role"] == "citizen" and str(complaint["user_id"]) != current_user["_id"]:
-            logger.warning(f"User {current_user.get('_id')} is not authorized to view complaint {complaint_id}.")
+            logger.warning("User %s is not authorized to view complaint %s.", current_user.get('_id'), complaint_id)
             raise HTTPException(status_code=403, detail="Not authorized to view this complaint")
 
-        logger.info(f"Successfully read complaint {complaint_id}.")
+        logger.info("Successfully read complaint %s.", complaint_id)
         return convert_id(complaint)
     except Exception as e:
-        logger.error(f"Error reading complaint {complaint_id}: {e}", exc_info=True)
+        logger.error("Error reading complaint %s: %s", complaint_id, e, exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while reading complaint: {e}")
 
 @router.put("/{complaint_id}", response_model=Complaint)
@@ -98,15 +108,15 @@ async def update_complaint(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        logger.info(f"Received request to update complaint {complaint_id} status to {status} for user: {current_user.get('_id')}")
+        logger.info("Received request to update complaint %s status to %s for user: %s", complaint_id, status, current_user.get('_id'))
         complaint = await complaints_collection.find_one({"_id": ObjectId(complaint_id)})
         if not complaint:
-            logger.warning(f"Complaint {complaint_id} not found for update.")
+            logger.warning("Complaint %s not found for update.", complaint_id)
             raise HTTPException(status_code=404, detail="Complaint not found")
 
         # Check authorization
         if current_user["role"] == "citizen" and str(complaint["user_id"]) != current_user["_id"]:
-            logger.warning(f"User {current_user.get('_id')} is not authorized to update complaint {complaint_id}.")
+            logger.warning("User %s is not authorized to update complaint %s.", current_user.get('_id'), complaint_id)
             raise HTTPException(status_code=403, detail="Not authorized to update this complaint")
 
         # Update complaint
@@ -123,10 +133,10 @@ async def update_complaint(
         )
 
         updated_complaint = await complaints_collection.find_one({"_id": ObjectId(complaint_id)})
-        logger.info(f"Successfully updated complaint {complaint_id}.")
+        logger.info("Successfully updated complaint %s.", complaint_id)
         return convert_id(updated_complaint)
     except Exception as e:
-        logger.error(f"Error updating complaint {complaint_id}: {e}", exc_info=True)
+        logger.error("Error updating complaint %s: %s", complaint_id, e, exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while updating complaint: {e}")
 
 @router.post("/{complaint_id}/assign")
@@ -136,19 +146,19 @@ async def assign_complaint(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        logger.info(f"Received request to assign complaint {complaint_id} to agency {agency_id} for user: {current_user.get('_id')}")
+        logger.info("Received request to assign complaint %s to agency %s for user: %s", complaint_id, agency_id, current_user.get('_id'))
         if current_user["role"] != "system_admin":
-            logger.warning(f"User {current_user.get('_id')} is not authorized to assign complaints.")
+            logger.warning("User %s is not authorized to assign complaints.", current_user.get('_id'))
             raise HTTPException(status_code=403, detail="Only system admin can assign complaints")
 
         complaint = await complaints_collection.find_one({"_id": ObjectId(complaint_id)})
         if not complaint:
-            logger.warning(f"Complaint {complaint_id} not found for assignment.")
+            logger.warning("Complaint %s not found for assignment.", complaint_id)
             raise HTTPException(status_code=404, detail="Complaint not found")
 
         agency = await agencies_collection.find_one({"_id": ObjectId(agency_id)})
         if not agency:
-            logger.warning(f"Agency {agency_id} not found for assignment.")
+            logger.warning("Agency %s not found for assignment.", agency_id)
             raise HTTPException(status_code=404, detail="Agency not found")
 
         await complaints_collection.update_one(
@@ -162,8 +172,8 @@ async def assign_complaint(
             }
         )
 
-        logger.info(f"Successfully assigned complaint {complaint_id} to agency {agency_id}.")
+        logger.info("Successfully assigned complaint %s to agency %s.", complaint_id, agency_id)
         return {"message": "Complaint assigned successfully"}
     except Exception as e:
-        logger.error(f"Error assigning complaint {complaint_id}: {e}", exc_info=True)
+        logger.error("Error assigning complaint %s: %s", complaint_id, e, exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An error occurred while assigning complaint: {e}") 
\ No newline at end of file
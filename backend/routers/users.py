@@ -4,7 +4,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional, List, Any
-from models import User, UserCreate
+from models import User, UserCreate, UserPartial
 from database import users_collection, convert_id
 from bson import ObjectId
 from .auth import (create_access_token,
@@ -12,11 +12,10 @@ from .auth import (create_access_token,
                    get_password_hash,
                    ACCESS_TOKEN_EXPIRE_MINUTES,
                    get_current_user)
+from projection import fields_projection, partial_response
 import logging
 from pydantic import ValidationError
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -66,14 +65,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
 async def register_user(request: Request):
     try:
         body = await request.json()
-        logger.info(f"Received registration request body: {body}")
         user = UserCreate(**body)
-        logger.info(f"Pydantic validation successful for user: {user.email}")
+        logger.info("Pydantic validation successful for user: %s", user.email)
 
         # Check if user already exists
         existing_user = await users_collection.find_one({"email": user.email})
         if existing_user:
-            logger.warning(f"Registration failed: User with email {user.email} already exists")
+            logger.warning("Registration failed: User with email %s already exists", user.email)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
@@ -81,7 +79,7 @@ async def register_user(request: Request):
         
         existing_user_national_id = await users_collection.find_one({"national_id": user.national_id})
         if existing_user_national_id:
-             logger.warning(f"Registration failed: User with national ID {user.national_id} already exists")
+             logger.warning("Registration failed: National ID already registered for %s", user.email)
              raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="National ID already registered"
@@ -96,17 +94,17 @@ async def register_user(request: Request):
         # Insert the new user
         new_user = await users_collection.insert_one(user_dict)
         created_user = await users_collection.find_one({"_id": new_user.inserted_id})
-        logger.info(f"User registered successfully with ID: {new_user.inserted_id}")
+        logger.info("User registered successfully with ID: %s", new_user.inserted_id)
         return created_user
         
     except ValidationError as e:
-        logger.error(f"Pydantic validation error during registration: {e.errors()}")
+        logger.error("Pydantic validation error during registration: %s", e.errors())
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=e.errors()
         )
     except Exception as e:
-        logger.error(f"Error during user registration: {e}", exc_info=True)
+        logger.error("Error during user registration: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Registration failed: {e}"
@@ -126,10 +124,10 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         access_token = create_access_token(
             data={"sub": str(user["_id"])}
         )
-        logger.info(f"User logged in successfully: {form_data.username}")
+        logger.info("User logged in successfully: %s", form_data.username)
         return {"access_token": access_token, "token_type": "bearer"}
     except Exception as e:
-        logger.error(f"Error during user login: {e}", exc_info=True)
+        logger.error("Error during user login: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Login failed: {e}"
@@ -138,30 +136,36 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 @router.get("/me", response_model=User)
 async def read_users_me(current_user: User = Depends(get_current_user)):
     try:
-        logger.info(f"Fetching current user details for user ID: {current_user.get('_id')}")
+        logger.info("Fetching current user details for user ID: %s", current_user.get('_id'))
         return current_user
     except Exception as e:
-        logger.error(f"Error fetching current user details: {e}", exc_info=True)
+        logger.error("Error fetching current user details: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch user details: {e}"
         )
 
-@router.get("/users", response_model=List[User])
-async def read_users(current_user: dict = Depends(get_current_user)):
+@router.get("/users", response_model=List[UserPartial])
+async def read_users(
+    current_user: dict = Depends(get_current_user),
+    projection: Optional[dict] = Depends(fields_projection(UserPartial))
+):
     try:
-        logger.info(f"Attempting to fetch all users for user ID: {current_user.get('_id')}")
+        logger.info("Attempting to fetch all users for user ID: %s", current_user.get('_id'))
         if current_user["role"] != "system_admin":
-            logger.warning(f"User {current_user.get('_id')} attempted to access all users without system_admin role.")
+            logger.warning("User %s attempted to access all users without system_admin role.", current_user.get('_id'))
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to view all users"
             )
-        users = await users_collection.find().to_list(length=None)
-        logger.info(f"Successfully fetched {len(users)} users.")
+        # Password hashes never leave the database on list requests
+        users = await users_collection.find({}, projection or {"hashed_password": 0}).to_list(length=None)
+        logger.info("Successfully fetched %s users.", len(users))
+        if projection is not None:
+            return partial_response(UserPartial, users)
         return [convert_id(user) for user in users]
     except Exception as e:
-        logger.error(f"Error fetching all users: {e}", exc_info=True)
+        logger.error("Error fetching all users: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch users: {e}"
@@ -0,0 +1,164 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError, ExecutionTimeout
+
+import escalation
+
+
+class FakeLeases:
+    """Mimics the lease upsert: a filter miss on an existing _id collides."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one_and_update(self, filter, update, upsert=False, return_document=None):
+        doc = self.docs.get(filter["_id"])
+        now = filter["$or"][1]["expires_at"]["$lte"]
+        if doc is not None and doc["holder"] != escalation.WORKER_ID and doc["expires_at"] > now:
+            raise DuplicateKeyError("E11000 duplicate key error")
+        doc = doc or {"_id": filter["_id"]}
+        doc.update(update["$set"])
+        self.docs[filter["_id"]] = doc
+        return doc
+
+
+def test_acquire_lease_takes_and_renews(monkeypatch):
+    leases = FakeLeases()
+    monkeypatch.setattr(escalation, "scheduler_leases_collection", leases)
+    now = datetime(2024, 1, 1)
+
+    assert asyncio.run(escalation.acquire_lease(now))
+    first_expiry = leases.docs[escalation.LEASE_NAME]["expires_at"]
+    assert asyncio.run(escalation.acquire_lease(now + timedelta(seconds=10)))
+    assert leases.docs[escalation.LEASE_NAME]["expires_at"] > first_expiry
+
+
+def test_acquire_lease_fails_while_another_worker_holds_it(monkeypatch):
+    leases = FakeLeases()
+    now = datetime(2024, 1, 1)
+    leases.docs[escalation.LEASE_NAME] = {
+        "_id": escalation.LEASE_NAME,
+        "holder": "other-worker",
+        "expires_at": now + timedelta(minutes=5),
+    }
+    monkeypatch.setattr(escalation, "scheduler_leases_collection", leases)
+
+    assert not asyncio.run(escalation.acquire_lease(now))
+    assert asyncio.run(escalation.acquire_lease(now + timedelta(minutes=10)))
+
+
+def test_build_update_bumps_priority():
+    now = datetime(2024, 1, 1)
+    complaint = {"_id": ObjectId(), "priority": "medium", "updated_at": now - timedelta(days=3)}
+
+    update = escalation._build_update(complaint, now)
+
+    assert update._filter == complaint
+    assert update._doc["$set"]["priority"] == "high"
+    assert update._doc["$inc"] == {"escalation_count": 1}
+
+
+def test_build_update_reroutes_top_priority_only_when_configured(monkeypatch):
+    now = datetime(2024, 1, 1)
+    complaint = {"_id": ObjectId(), "priority": "critical", "updated_at": now - timedelta(days=3)}
+
+    monkeypatch.setattr(escalation, "ESCALATION_AGENCY_ID", None)
+    assert escalation._build_update(complaint, now) is None
+
+    agency_id = ObjectId()
+    monkeypatch.setattr(escalation, "ESCALATION_AGENCY_ID", str(agency_id))
+    update = escalation._build_update(complaint, now)
+    assert update._doc["$set"]["agency_id"] == agency_id
+    assert "priority" not in update._doc["$set"]
+    assert "status" not in update._doc["$set"]
+
+
+class FakeCursor:
+    def __init__(self, documents=()):
+        self.documents = list(documents)
+
+    def hint(self, index):
+        return self
+
+    def limit(self, limit):
+        return self
+
+    def max_time_ms(self, max_time_ms):
+        assert max_time_ms >= 1
+        return self
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class TimingOutCursor(FakeCursor):
+    async def to_list(self, length=None):
+        raise ExecutionTimeout("operation exceeded time limit")
+
+
+class FakeComplaints:
+    def find(self, query, projection):
+        return TimingOutCursor()
+
+
+class RecordingLeases:
+    def __init__(self):
+        self.updates = []
+
+    async def update_one(self, filter, update):
+        self.updates.append(update)
+
+
+def test_run_escalation_records_stats_when_budget_runs_out(monkeypatch):
+    leases = RecordingLeases()
+    monkeypatch.setattr(escalation, "complaints_collection", FakeComplaints())
+    monkeypatch.setattr(escalation, "scheduler_leases_collection", leases)
+
+    stats = asyncio.run(escalation.run_escalation())
+
+    assert stats["completed"] is False
+    assert leases.updates[0]["$set"]["last_run"] is stats
+
+
+class BulkWriteResult:
+    def __init__(self, modified_count):
+        self.modified_count = modified_count
+
+
+class StaleComplaints:
+    """Returns one batch of stale complaints; one bump loses to a concurrent update."""
+
+    def __init__(self, complaints):
+        self.complaints = complaints
+        self.writes = []
+
+    def find(self, query, projection):
+        complaints, self.complaints = self.complaints, []
+        return FakeCursor(complaints)
+
+    async def bulk_write(self, requests, ordered=True):
+        self.writes.append(requests)
+        modified = len(requests) - 1 if len(self.writes) == 1 else len(requests)
+        return BulkWriteResult(modified)
+
+
+def test_run_escalation_counts_only_applied_writes(monkeypatch):
+    stale = datetime(2000, 1, 1)
+    complaints = StaleComplaints([
+        {"_id": ObjectId(), "priority": "low", "updated_at": stale},
+        {"_id": ObjectId(), "priority": "high", "updated_at": stale},
+        {"_id": ObjectId(), "priority": "critical", "updated_at": stale},
+    ])
+    monkeypatch.setattr(escalation, "ESCALATION_AGENCY_ID", str(ObjectId()))
+    monkeypatch.setattr(escalation, "complaints_collection", complaints)
+    monkeypatch.setattr(escalation, "scheduler_leases_collection", RecordingLeases())
+
+    stats = asyncio.run(escalation.run_escalation())
+
+    assert [len(writes) for writes in complaints.writes] == [2, 1]
+    assert stats["priority_bumped"] == 1
+    assert stats["rerouted"] == 1
+    assert stats["escalated"] == 2
+    assert stats["conflicts"] == 1
@@ -0,0 +1,123 @@
+import json
+import logging
+import queue
+
+import logging_config
+from logging_config import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+    SamplingFilter,
+    request_id_var,
+)
+
+
+def make_record(name="routers.complaints", level=logging.INFO, msg="hello", args=(), request_id=None):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.request_id = request_id
+    return record
+
+
+def test_request_id_filter_stamps_current_request():
+    token = request_id_var.set("req-1")
+    try:
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "hello", (), None)
+        assert RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    assert record.request_id == "req-1"
+
+
+def test_sampling_is_decided_once_per_request():
+    sampler = SamplingFilter(0.5)
+    request_ids = [f"req-{i}" for i in range(200)]
+
+    kept = [sampler.filter(make_record(request_id=rid)) for rid in request_ids]
+
+    assert 0 < sum(kept) < len(kept)
+    for rid, first in zip(request_ids, kept):
+        assert sampler.filter(make_record(msg="second line", request_id=rid)) == first
+
+
+def test_sampling_keeps_warnings_unrequested_and_unsampled_loggers():
+    sampler = SamplingFilter(0.0)
+
+    assert not sampler.filter(make_record(request_id="req-1"))
+    assert sampler.filter(make_record(level=logging.WARNING, request_id="req-1"))
+    assert sampler.filter(make_record(request_id=None))
+    assert sampler.filter(make_record(name="escalation", request_id="req-1"))
+
+
+def test_formatter_redacts_args_extras_and_message_text():
+    record = make_record(
+        msg="body %s token=%s Authorization: Bearer abc.def.ghi",
+        args=({"email": "a@b.rw", "password": "secret"}, "abc"),
+    )
+    record.national_id = "1199880012345678"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert "secret" not in entry["message"]
+    assert "abc" not in entry["message"]
+    assert entry["message"].endswith("Authorization: ***")
+    assert "a@b.rw" in entry["message"]
+    assert entry["national_id"] == logging_config.REDACTED
+
+
+def test_message_redaction_keeps_surrounding_text_and_other_keys():
+    record = make_record(msg="%s max_tokens=5", args=(["national_id=123"],))
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "['national_id=***'] max_tokens=5"
+
+
+def test_prepare_snapshots_args():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    handler.setFormatter(JsonFormatter())
+    query = {"status": "pending"}
+
+    prepared = handler.prepare(make_record(msg="query %s", args=(query,)))
+    query["status"] = "resolved"
+
+    assert prepared.getMessage() == "query {'status': 'pending'}"
+
+
+def test_full_queue_drops_info_but_keeps_warnings(monkeypatch, capsys):
+    monkeypatch.setattr(logging_config, "LOG_QUEUE_BLOCK_SECONDS", 0.01)
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    handler.setFormatter(JsonFormatter())
+    handler.queue.put_nowait(make_record())
+
+    handler.handle(make_record(msg="dropped"))
+    handler.handle(make_record(level=logging.ERROR, msg="kept"))
+
+    assert handler.dropped == 1
+    assert json.loads(capsys.readouterr().err)["message"] == "kept"
+
+
+def test_color_message_extra_is_not_emitted():
+    record = make_record(msg="Started server process [%d]", args=(42,))
+    record.color_message = "Started server process [\x1b[36m%d\x1b[0m]"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert "color_message" not in entry
+
+
+def test_records_logged_after_stop_reach_stderr(capsys):
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    try:
+        logging_config.setup_logging()
+        logging_config.stop_logging()
+        logging.getLogger("shutdown").error("Finished server process")
+
+        assert json.loads(capsys.readouterr().err)["message"] == "Finished server process"
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
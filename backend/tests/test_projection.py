@@ -0,0 +1,148 @@
+import sys
+import types
+
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# routers/users.py imports ``.auth``, which is not part of this tree; give it a
+# stand-in so the real router can be imported and exercised
+if "routers.auth" not in sys.modules:
+    _auth = types.ModuleType("routers.auth")
+    _auth.create_access_token = _auth.authenticate_user = _auth.get_password_hash = None
+    _auth.get_current_user = None
+    _auth.ACCESS_TOKEN_EXPIRE_MINUTES = 30
+    sys.modules["routers.auth"] = _auth
+
+from models import Complaint, ComplaintPartial, User, UserPartial  # noqa: E402
+from routers import complaints, users  # noqa: E402
+
+COMPLAINT = {
+    "_id": ObjectId(),
+    "title": "Broken water pipe",
+    "description": "Water has been leaking for a week" * 20,
+    "category": "water",
+    "location": "Kigali",
+    "status": "pending",
+    "priority": "medium",
+    "attachments": [],
+    "user_id": ObjectId(),
+}
+USER = {
+    "_id": ObjectId(),
+    "email": "citizen@example.rw",
+    "full_name": "Citizen",
+    "phone_number": "0788000000",
+    "national_id": "1199880012345678",
+    "role": "citizen",
+    "is_active": True,
+    "hashed_password": "$2b$12$hash",
+}
+ADMIN = {"_id": str(ObjectId()), "role": "system_admin", "is_active": True}
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def skip(self, skip):
+        return self
+
+    def limit(self, limit):
+        return self
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class FakeCollection:
+    """Applies inclusion/exclusion projections like Mongo and records them."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.projections = []
+
+    def find(self, query=None, projection=None):
+        self.projections.append(projection)
+        documents = [dict(document) for document in self.documents]
+        if projection:
+            if any(projection.values()):
+                documents = [{k: v for k, v in d.items() if projection.get(k)} for d in documents]
+            else:
+                documents = [{k: v for k, v in d.items() if k not in projection} for d in documents]
+        return FakeCursor(documents)
+
+
+def make_client(router, monkeypatch, **collections):
+    for name, collection in collections.items():
+        monkeypatch.setattr(router, name, collection)
+    app = FastAPI()
+    app.include_router(router.router)
+    app.dependency_overrides[users.get_current_user] = lambda: ADMIN
+    return TestClient(app)
+
+
+def test_complaints_default_response_keeps_full_shape(monkeypatch):
+    collection = FakeCollection([COMPLAINT])
+    client = make_client(complaints, monkeypatch, complaints_collection=collection)
+
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert collection.projections == [None]
+    body = response.json()[0]
+    assert body["description"] == COMPLAINT["description"]
+    assert body["agency_id"] is None
+    assert body["resolved_at"] is None
+
+
+def test_complaints_fields_are_pushed_down_as_projection(monkeypatch):
+    collection = FakeCollection([COMPLAINT])
+    client = make_client(complaints, monkeypatch, complaints_collection=collection)
+
+    response = client.get("/", params={"fields": "title, status"})
+
+    assert collection.projections == [{"title": 1, "status": 1, "_id": 1}]
+    assert response.json() == [{"_id": str(COMPLAINT["_id"]), "title": "Broken water pipe", "status": "pending"}]
+
+
+def test_unknown_fields_are_rejected(monkeypatch):
+    collection = FakeCollection([COMPLAINT])
+    client = make_client(complaints, monkeypatch, complaints_collection=collection)
+
+    response = client.get("/", params={"fields": "title,bogus"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: bogus"
+    assert collection.projections == []
+
+
+def test_read_users_never_loads_hashed_password(monkeypatch):
+    collection = FakeCollection([USER])
+    client = make_client(users, monkeypatch, users_collection=collection)
+
+    response = client.get("/auth/users")
+
+    assert response.status_code == 200
+    assert collection.projections == [{"hashed_password": 0}]
+    body = response.json()[0]
+    assert "hashed_password" not in body
+    assert body["email"] == USER["email"]
+    assert body["parent_role"] is None
+
+
+def test_read_users_rejects_hashed_password_field(monkeypatch):
+    collection = FakeCollection([USER])
+    client = make_client(users, monkeypatch, users_collection=collection)
+
+    assert client.get("/auth/users", params={"fields": "email,hashed_password"}).status_code == 400
+    response = client.get("/auth/users", params={"fields": "email"})
+
+    assert collection.projections == [{"email": 1, "_id": 1}]
+    assert response.json() == [{"_id": str(USER["_id"]), "email": USER["email"]}]
+
+
+def test_partial_models_follow_full_models():
+    assert set(ComplaintPartial.__fields__) == set(Complaint.__fields__)
+    assert set(UserPartial.__fields__) == set(User.__fields__) - {"hashed_password"}
+    assert all(not field.required for field in ComplaintPartial.__fields__.values())